@@ -0,0 +1,32 @@
+# =============================================
+# build_indicators_aot.py – AOT kernel build
+# =============================================
+"""Ahead-of-time compile of the full-series indicator kernels.
+
+Running ``python build_indicators_aot.py`` produces an ``indicators_aot``
+extension module next to the sources; ``indicators_jit`` picks it up at
+import, so a fresh process skips numba's JIT machinery for the series
+kernels entirely. Requires numba and a working C compiler.
+
+Only the float64 full-series kernels are exported – the scalar step
+kernels stay JIT so they can specialize on the live bot's float32 input.
+"""
+
+from numba.pycc import CC
+
+import indicators_jit as taj
+
+
+def _plain(fn):
+    # cc.export wants the undecorated function, not the JIT dispatcher.
+    return getattr(fn, "py_func", fn)
+
+
+cc = CC("indicators_aot")
+
+cc.export("ema_series", "f8[:](f8[:], i8)")(_plain(taj.ema_series))
+cc.export("rsi_series", "f8[:](f8[:], i8)")(_plain(taj.rsi_series))
+cc.export("atr_series", "f8[:](f8[:], f8[:], f8[:], i8)")(_plain(taj.atr_series))
+
+if __name__ == "__main__":
+    cc.compile()
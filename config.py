@@ -1,59 +1,76 @@
-"""
-Global strategy settings.
-Edit only the plain  NAME = value  lines – no complex syntax.
-"""
-
-from pathlib import Path
-
-SIGNAL_COOLDOWN_MINUTES = 240 # Cooldown per symbol after a signal is sent
-
-# ─── Live Bot & Notification Settings ────────────────────────────────
-TELEGRAM_BOT_TOKEN    = "7770157032:AAGO-J_Mb8Oxg3i6xQmWTj3rM3JMO5MMscQ"  # Replace with your Bot Token
-TELEGRAM_CHAT_ID      = "2133130545"    # Replace with your Chat ID
-BOT_TIMEFRAME         = "5m"                       # Timeframe for the bot to check for signals
-BOT_SCHEDULE_MINUTES  = 1                          # How often to check for new signals
-
-# In config.py
-DEBUG_SYMBOL = "HUSDT"  # Set to a symbol to get detailed logs, or None to disable
-# ─── Data locations ──────────────────────────────────────────────────
-PROJECT_ROOT = Path(__file__).resolve().parent
-SYMBOLS_FILE = PROJECT_ROOT / "symbols.txt"
-
-# =============================================================================
-# "NEW CHAMPION" STRATEGY PARAMETERS
-# The bot will check against these values and report if they are met.
-# =============================================================================
-
-# ─── Core Signal Generation (The Trigger for an Alert) ───────────────
-PRICE_BOOM_PERIOD_H      = 24
-# This is now the MINIMUM threshold to trigger a basic alert.
-# We will check our champion value (0.20) as a separate condition.
-PRICE_BOOM_PCT           = 0.13
-
-PRICE_SLOWDOWN_PERIOD_H  = 4
-PRICE_SLOWDOWN_PCT       = 0.01
-
-# ─── Champion Strategy Filter Values (For Checking) ──────────────────
-CHAMPION_MIN_BOOM_PCT    = 0.15      # The ideal boom threshold from our analysis
-CHAMPION_MIN_RSI         = 30      # Replace with your exact SPSS cutpoint value
-
-# ─── Primary Environmental Filter: BTC Slow Trend ──────────────
-BTC_SLOW_FILTER_ENABLED   = True
-BTC_SLOW_TIMEFRAME        = "1D"
-BTC_SLOW_EMA_PERIOD       = 200
-
-# ─── Trade Management / Exit Parameters (For Display) ──────────
-SL_ATR_MULT              = 2.5
-PARTIAL_TP_ATR_MULT      = 1.0
-TRAIL_ATR_MULT_FINAL     = 1
-
-# ─── Trade Management / Exit Parameters (For Display) ──────────
-PARTIAL_TP_ATR_MULT      = 1.0       # Partial Take-Profit = 1 * ATR
-TP2_ATR_MULT             = 6.0       # <--- ADD THIS LINE. Informational target for the runner.
-TRAIL_ATR_MULT_FINAL     = 1         # Trailing Stop Distance = 1.5 * ATR
-
-# ─── Indicator Calculation Parameters ──────────────────────────
-RSI_TIMEFRAME = "1h"
-RSI_PERIOD    = 14
-ATR_TIMEFRAME = "1h"
-ATR_PERIOD    = 14
+"""
+Global strategy settings.
+
+Everything lives on the frozen ``Cfg`` dataclass below – edit the plain
+NAME: type = value  lines. The old module had two blocks redefining the
+same names (the second silently won); a single class body keeps each knob
+defined exactly once, and ``slots=True`` makes ``cfg.X`` reads go through
+C-level slot descriptors instead of module-dict lookups.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+
+# ─── Data locations ──────────────────────────────────────────────────
+PROJECT_ROOT = Path(__file__).resolve().parent
+SYMBOLS_FILE = PROJECT_ROOT / "symbols.txt"
+PARQUET_DIR  = PROJECT_ROOT / "ohlcv_cache"   # Rolling OHLCV cache, one file per (symbol, timeframe)
+if not PARQUET_DIR.is_dir():                  # warm starts skip the mkdir syscall
+    PARQUET_DIR.mkdir()
+
+
+@dataclass(frozen=True, slots=True)
+class Cfg:
+    SIGNAL_COOLDOWN_MINUTES: int = 240  # Cooldown per symbol after a signal is sent
+
+    # ─── Live Bot & Notification Settings ────────────────────────────
+    TELEGRAM_BOT_TOKEN: str = "7770157032:AAGO-J_Mb8Oxg3i6xQmWTj3rM3JMO5MMscQ"  # Replace with your Bot Token
+    TELEGRAM_CHAT_ID:   str = "2133130545"    # Replace with your Chat ID
+    BOT_TIMEFRAME:      str = "5m"            # Timeframe for the bot to check for signals
+    BOT_SCHEDULE_MINUTES: int = 1             # How often to check for new signals
+    WS_KLINE_ENABLED: bool = False            # Push bars over websocket instead of REST polling
+
+    DEBUG_SYMBOL: str | None = "HUSDT"  # Set to a symbol to get detailed logs, or None to disable
+
+    # ─── Data locations ──────────────────────────────────────────────
+    PROJECT_ROOT: Path = PROJECT_ROOT
+    SYMBOLS_FILE: Path = SYMBOLS_FILE
+    PARQUET_DIR:  Path = PARQUET_DIR
+
+    # =================================================================
+    # "NEW CHAMPION" STRATEGY PARAMETERS
+    # The bot will check against these values and report if they are met.
+    # =================================================================
+
+    # ─── Core Signal Generation (The Trigger for an Alert) ───────────
+    PRICE_BOOM_PERIOD_H: int = 24
+    # This is now the MINIMUM threshold to trigger a basic alert.
+    # We will check our champion value (0.20) as a separate condition.
+    PRICE_BOOM_PCT: float = 0.13
+
+    PRICE_SLOWDOWN_PERIOD_H: int = 4
+    PRICE_SLOWDOWN_PCT: float = 0.01
+
+    # ─── Champion Strategy Filter Values (For Checking) ──────────────
+    CHAMPION_MIN_BOOM_PCT: float = 0.15  # The ideal boom threshold from our analysis
+    CHAMPION_MIN_RSI: float = 30         # Replace with your exact SPSS cutpoint value
+
+    # ─── Primary Environmental Filter: BTC Slow Trend ────────────────
+    BTC_SLOW_FILTER_ENABLED: bool = True
+    BTC_SLOW_TIMEFRAME: str = "1D"
+    BTC_SLOW_EMA_PERIOD: int = 200
+
+    # ─── Trade Management / Exit Parameters (For Display) ────────────
+    SL_ATR_MULT: float = 2.5
+    PARTIAL_TP_ATR_MULT: float = 1.0     # Partial Take-Profit = 1 * ATR
+    TP2_ATR_MULT: float = 6.0            # Informational target for the runner.
+    TRAIL_ATR_MULT_FINAL: float = 1      # Trailing Stop Distance = 1 * ATR
+
+    # ─── Indicator Calculation Parameters ────────────────────────────
+    RSI_TIMEFRAME: str = "1h"
+    RSI_PERIOD: int = 14
+    ATR_TIMEFRAME: str = "1h"
+    ATR_PERIOD: int = 14
+
+
+cfg = Cfg()
@@ -0,0 +1,222 @@
+# =============================================
+# indicators_jit.py – numba kernels for the bot
+# =============================================
+"""Seed and catch-up kernels for the live bot's incremental indicator state.
+
+• Uses numba's ``@njit(cache=True)`` when numba is installed.
+• Falls back to plain Python otherwise – still fine for the ≤1-bar
+  steady-state steps, just slower on cold-start seeding.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):  # no-op decorator fallback
+        if args and callable(args[0]):
+            return args[0]
+
+        def wrap(func):
+            return func
+        return wrap
+
+__all__ = [
+    "ema_seed", "ema_catchup",
+    "rsi_seed", "rsi_catchup",
+    "atr_seed", "atr_catchup",
+    "ema_series", "rsi_series", "atr_series",
+    "HAS_NUMBA",
+]
+
+
+@njit(cache=True)
+def ema_seed(closes: np.ndarray, span: int) -> float:
+    """EMA over the full array (pandas ewm(adjust=False) convention)."""
+    alpha = 2.0 / (span + 1.0)
+    ema = closes[0]
+    for i in range(1, closes.shape[0]):
+        ema = alpha * closes[i] + (1.0 - alpha) * ema
+    return ema
+
+
+@njit(cache=True)
+def ema_catchup(ema: float, closes: np.ndarray, alpha: float) -> float:
+    for i in range(closes.shape[0]):
+        ema = alpha * closes[i] + (1.0 - alpha) * ema
+    return ema
+
+
+@njit(cache=True)
+def rsi_seed(closes: np.ndarray, period: int):
+    """Wilder avg_gain/avg_loss over the full array."""
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, period + 1):
+        d = closes[i] - closes[i - 1]
+        if d > 0.0:
+            avg_gain += d
+        else:
+            avg_loss -= d
+    avg_gain /= period
+    avg_loss /= period
+    for i in range(period + 1, closes.shape[0]):
+        d = closes[i] - closes[i - 1]
+        gain = d if d > 0.0 else 0.0
+        loss = -d if d < 0.0 else 0.0
+        avg_gain = (avg_gain * (period - 1) + gain) / period
+        avg_loss = (avg_loss * (period - 1) + loss) / period
+    return avg_gain, avg_loss
+
+
+@njit(cache=True)
+def rsi_catchup(avg_gain: float, avg_loss: float, prev_close: float,
+                closes: np.ndarray, period: int):
+    for i in range(closes.shape[0]):
+        d = closes[i] - prev_close
+        gain = d if d > 0.0 else 0.0
+        loss = -d if d < 0.0 else 0.0
+        avg_gain = (avg_gain * (period - 1) + gain) / period
+        avg_loss = (avg_loss * (period - 1) + loss) / period
+        prev_close = closes[i]
+    return avg_gain, avg_loss, prev_close
+
+
+@njit(cache=True)
+def atr_seed(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+             period: int) -> float:
+    """Wilder ATR over the full arrays."""
+    atr = 0.0
+    for i in range(1, period + 1):
+        tr = high[i] - low[i]
+        d = abs(high[i] - close[i - 1])
+        if d > tr:
+            tr = d
+        d = abs(low[i] - close[i - 1])
+        if d > tr:
+            tr = d
+        atr += tr
+    atr /= period
+    for i in range(period + 1, close.shape[0]):
+        tr = high[i] - low[i]
+        d = abs(high[i] - close[i - 1])
+        if d > tr:
+            tr = d
+        d = abs(low[i] - close[i - 1])
+        if d > tr:
+            tr = d
+        atr = (atr * (period - 1) + tr) / period
+    return atr
+
+
+@njit(cache=True)
+def atr_catchup(atr: float, prev_close: float, high: np.ndarray,
+                low: np.ndarray, close: np.ndarray, period: int):
+    for i in range(close.shape[0]):
+        tr = high[i] - low[i]
+        d = abs(high[i] - prev_close)
+        if d > tr:
+            tr = d
+        d = abs(low[i] - prev_close)
+        if d > tr:
+            tr = d
+        atr = (atr * (period - 1) + tr) / period
+        prev_close = close[i]
+    return atr, prev_close
+
+
+# --- Full-series kernels ---
+# Used by indicators.py as the middle preference between TA-Lib and
+# pandas_ta; same recurrences as the scalar kernels above, but returning
+# the whole series for callers that need more than the latest value.
+
+@njit(cache=True)
+def ema_series(closes: np.ndarray, span: int) -> np.ndarray:
+    """EMA series (pandas ewm(adjust=False) convention)."""
+    n = closes.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    if n == 0:
+        return out
+    alpha = 2.0 / (span + 1.0)
+    ema = closes[0]
+    out[0] = ema
+    for i in range(1, n):
+        ema = alpha * closes[i] + (1.0 - alpha) * ema
+        out[i] = ema
+    return out
+
+
+@njit(cache=True)
+def rsi_series(closes: np.ndarray, period: int) -> np.ndarray:
+    """Wilder RSI series; the first `period` values are NaN."""
+    n = closes.shape[0]
+    out = np.full(n, np.nan)
+    if n <= period:
+        return out
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, period + 1):
+        d = closes[i] - closes[i - 1]
+        if d > 0.0:
+            avg_gain += d
+        else:
+            avg_loss -= d
+    avg_gain /= period
+    avg_loss /= period
+    out[period] = 100.0 if avg_loss == 0.0 else 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    for i in range(period + 1, n):
+        d = closes[i] - closes[i - 1]
+        gain = d if d > 0.0 else 0.0
+        loss = -d if d < 0.0 else 0.0
+        avg_gain = (avg_gain * (period - 1) + gain) / period
+        avg_loss = (avg_loss * (period - 1) + loss) / period
+        out[i] = 100.0 if avg_loss == 0.0 else 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    return out
+
+
+@njit(cache=True)
+def atr_series(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+               period: int) -> np.ndarray:
+    """Wilder ATR series; the first `period` values are NaN."""
+    n = close.shape[0]
+    out = np.full(n, np.nan)
+    if n <= period:
+        return out
+    atr = 0.0
+    for i in range(1, period + 1):
+        tr = high[i] - low[i]
+        d = abs(high[i] - close[i - 1])
+        if d > tr:
+            tr = d
+        d = abs(low[i] - close[i - 1])
+        if d > tr:
+            tr = d
+        atr += tr
+    atr /= period
+    out[period] = atr
+    for i in range(period + 1, n):
+        tr = high[i] - low[i]
+        d = abs(high[i] - close[i - 1])
+        if d > tr:
+            tr = d
+        d = abs(low[i] - close[i - 1])
+        if d > tr:
+            tr = d
+        atr = (atr * (period - 1) + tr) / period
+        out[i] = atr
+    return out
+
+
+# AOT-compiled copies (see build_indicators_aot.py) take precedence when
+# the extension has been built – they skip even the cached-JIT load on
+# startup. The scalar step kernels deliberately stay JIT so they can
+# specialize on the live bot's float32 frames.
+try:
+    from indicators_aot import ema_series, rsi_series, atr_series  # type: ignore  # noqa: F811
+except ImportError:
+    pass
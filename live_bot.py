@@ -1,232 +1,778 @@
-# live_bot.py (UPDATED VERSION)
-
-import time
-import logging
-import pandas as pd
-import ccxt
-import schedule
-import telegram
-import asyncio
-import json
-from pathlib import Path
-import traceback
-
-import config as cfg
-import indicators as ta
-
-# --- Setup Logging ---
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    handlers=[
-        logging.FileHandler("live_bot.log"),
-        logging.StreamHandler()
-    ]
-)
-
-# --- Helper functions for Cooldown ---
-COOLDOWN_FILE = Path("signal_cooldowns.json")
-
-def load_cooldowns() -> dict:
-    if not COOLDOWN_FILE.exists():
-        return {}
-    try:
-        with open(COOLDOWN_FILE, 'r') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, FileNotFoundError):
-        return {}
-
-def save_cooldowns(cooldowns: dict):
-    with open(COOLDOWN_FILE, 'w') as f:
-        json.dump(cooldowns, f, indent=4)
-
-# --- CCXT Data Fetcher ---
-def fetch_bybit_data(
-    symbol: str,
-    timeframe: str,
-    bybit: ccxt.Exchange,
-    limit: int = 300
-) -> pd.DataFrame | None:
-    """Fetches OHLCV from Bybit, handling pagination & errors.
-
-    Always passes `since=None, limit=limit` and lowercases the timeframe.
-    """
-    tf = timeframe.lower()
-    try:
-        logging.info(f"Fetching {symbol} on {tf}...")
-        ohlcv = bybit.fetch_ohlcv(
-            symbol=symbol,
-            timeframe=tf,
-            since=None,
-            limit=limit
-        )
-        if not ohlcv:
-            logging.warning(f"No data returned for {symbol} on {tf}.")
-            return None
-
-        df = pd.DataFrame(
-            ohlcv,
-            columns=['timestamp', 'open', 'high', 'low', 'close', 'volume']
-        )
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms', utc=True)
-        df.set_index('timestamp', inplace=True)
-        logging.info(f"Retrieved {len(df)} bars for {symbol} on {tf}.")
-        return df
-
-    except Exception:
-        logging.error(f"An unexpected error occurred fetching data for {symbol} on {tf}:")
-        logging.error(traceback.format_exc())
-        return None
-
-# --- Telegram Notifier ---
-async def send_telegram_message(message: str):
-    try:
-        bot = telegram.Bot(token=cfg.TELEGRAM_BOT_TOKEN)
-        await bot.send_message(
-            chat_id=cfg.TELEGRAM_CHAT_ID,
-            text=message,
-            parse_mode='Markdown'
-        )
-        logging.info("Successfully sent Telegram notification.")
-    except Exception:
-        logging.error("Failed to send Telegram message:")
-        logging.error(traceback.format_exc())
-
-# --- Data Preparation ---
-def _prep_live_data(symbol: str, bybit: ccxt.Exchange) -> pd.DataFrame | None:
-    df5 = fetch_bybit_data(symbol, cfg.BOT_TIMEFRAME, bybit, limit=500)
-    df_atr_tf = fetch_bybit_data(symbol, cfg.ATR_TIMEFRAME, bybit)
-    df_rsi_tf = fetch_bybit_data(symbol, cfg.RSI_TIMEFRAME, bybit)
-
-    if any(d is None for d in [df5, df_atr_tf, df_rsi_tf]):
-        logging.warning(f"Could not fetch one or more essential timeframes for {symbol}. Skipping.")
-        return None
-
-    df5[f"atr_{cfg.ATR_TIMEFRAME}"] = ta.atr(df_atr_tf, cfg.ATR_PERIOD).reindex(df5.index, method="ffill")
-    df5[f"rsi_{cfg.RSI_TIMEFRAME}"] = ta.rsi(df_rsi_tf["close"], cfg.RSI_PERIOD).reindex(df5.index, method="ffill")
-
-    BARS_PER_HOUR = 60 // int(cfg.BOT_TIMEFRAME.replace('m', ''))
-    BOOM_BAR_COUNT = BARS_PER_HOUR * cfg.PRICE_BOOM_PERIOD_H
-    SLOWDOWN_BAR_COUNT = BARS_PER_HOUR * cfg.PRICE_SLOWDOWN_PERIOD_H
-    df5["close_boom_ago"] = df5["close"].shift(BOOM_BAR_COUNT)
-    df5["close_slowdown_ago"] = df5["close"].shift(SLOWDOWN_BAR_COUNT)
-
-    return df5.dropna(subset=['close_boom_ago', f"rsi_{cfg.RSI_TIMEFRAME}", f"atr_{cfg.ATR_TIMEFRAME}"])
-
-# --- Main Signal Checking Logic ---
-def check_for_signals():
-    logging.info("--- Starting new signal check cycle ---")
-    
-    cooldowns = load_cooldowns()
-    
-    try:
-        bybit = ccxt.bybit({'options': {'defaultType': 'swap'}})
-        bybit.load_markets()
-    except Exception:
-        logging.error("Failed to initialize exchange or load markets:")
-        logging.error(traceback.format_exc())
-        return
-
-    btc_is_strong = False
-    if cfg.BTC_SLOW_FILTER_ENABLED:
-        btc_df = fetch_bybit_data("BTCUSDT", cfg.BTC_SLOW_TIMEFRAME, bybit)
-        if btc_df is not None and not btc_df.empty:
-            btc_df['ema'] = ta.ema(btc_df['close'], cfg.BTC_SLOW_EMA_PERIOD)
-            btc_last = btc_df.iloc[-1]
-            if pd.notna(btc_last.get('close')) and pd.notna(btc_last.get('ema')):
-                btc_is_strong = btc_last['close'] > btc_last['ema']
-
-    try:
-        with open(cfg.SYMBOLS_FILE, 'r') as fh:
-            symbols = [line.split()[0].strip().upper() for line in fh if line.strip() and not line.strip().startswith("#")]
-    except FileNotFoundError:
-        logging.error(f"'{cfg.SYMBOLS_FILE}' not found. Exiting.")
-        return
-
-    for symbol in symbols:
-        if symbol in cooldowns and pd.Timestamp.now(tz='UTC') < pd.to_datetime(cooldowns[symbol]):
-            continue
-
-        logging.info(f"--- Checking {symbol} ---")
-        
-        df_prep = _prep_live_data(symbol, bybit)
-        if df_prep is None or df_prep.empty:
-            logging.warning(f"Could not prepare data for {symbol}, skipping.")
-            continue
-        
-        last_candle = df_prep.iloc[-2]
-        
-        boom_ret = (last_candle["close"] / last_candle["close_boom_ago"]) - 1
-        slowdown_ret = (last_candle["close"] / last_candle["close_slowdown_ago"]) - 1
-        boom_cond = boom_ret >= cfg.PRICE_BOOM_PCT
-        slow_cond = slowdown_ret <= cfg.PRICE_SLOWDOWN_PCT
-        
-        if not (boom_cond and slow_cond):
-            continue
-        
-        logging.info(f"!!! POTENTIAL SIGNAL FOUND for {symbol} !!! Building report...")
-
-        champion_boom_ok = boom_ret >= cfg.CHAMPION_MIN_BOOM_PCT
-        
-        rsi_val = last_candle.get(f"rsi_{cfg.RSI_TIMEFRAME}", float('nan'))
-        champion_rsi_ok = pd.notna(rsi_val) and rsi_val >= cfg.CHAMPION_MIN_RSI
-        
-        champion_btc_ok = btc_is_strong
-        champion_slow_ok = slow_cond
-
-        all_champion_filters_met = champion_boom_ok and champion_rsi_ok and champion_btc_ok
-        
-        title = "✅ *CHAMPION SIGNAL* ✅" if all_champion_filters_met else "⚠️ *POTENTIAL SIGNAL* ⚠️"
-        
-        filter_lines = [
-            f"{'✅' if champion_boom_ok else '❌'} *Boom > {cfg.CHAMPION_MIN_BOOM_PCT:.0%}?* (`{boom_ret:.2%}`)",
-            f"{'✅' if champion_slow_ok  else '❌'} *Slowdown ≤ {cfg.PRICE_SLOWDOWN_PCT:.0%}?* (`{slowdown_ret:.2%}`)\n",
-            f"{'✅' if champion_rsi_ok else '❌'} *RSI > {cfg.CHAMPION_MIN_RSI}?* (`{rsi_val:.2f}`)",
-            f"{'✅' if champion_btc_ok else '❌'} *BTC Strong?* (`{btc_is_strong}`)"
-        ]
-        filter_checklist = "\n".join(filter_lines)
-
-        entry_price = last_candle['close']
-        atr_value = last_candle.get(f"atr_{cfg.ATR_TIMEFRAME}", float('nan'))
-        
-        if pd.isna(atr_value):
-            logging.warning(f"ATR value is NaN for {symbol}. Cannot calculate trade parameters.")
-            continue
-
-        stop_loss = entry_price + cfg.SL_ATR_MULT * atr_value
-        partial_tp = entry_price - cfg.PARTIAL_TP_ATR_MULT * atr_value
-        tp2_price = entry_price - cfg.TP2_ATR_MULT * atr_value
-        trail_dist = cfg.TRAIL_ATR_MULT_FINAL * atr_value
-
-        message = (
-            f"{title}\n\n"
-            f"**Symbol:** `{symbol}`\n"
-            f"**Time:** `{last_candle.name.strftime('%Y-%m-%d %H:%M')}` UTC\n\n"
-            f"--- *Champion Filter Checklist* ---\n"
-            f"{filter_checklist}\n\n"
-            f"--- *Actionable Trade Parameters* ---\n"
-            f"**Entry Price:** `{entry_price:.4f}`\n"
-            f"**1. Stop-Loss (SL):** `{stop_loss:.4f}` ({cfg.SL_ATR_MULT} ATR)\n"
-            f"**2. Partial Take-Profit (TP1):** `{partial_tp:.4f}` ({cfg.PARTIAL_TP_ATR_MULT} ATR)\n"
-            f"**3. Trailing Stop Distance:** `{trail_dist:.5f}` (Set after TP1 is hit)\n\n"
-            f"--- *Informational Target* ---\n"
-            f"**Potential Target (TP2):** `{tp2_price:.4f}` ({cfg.TP2_ATR_MULT} ATR)\n"
-        )
-        
-        asyncio.run(send_telegram_message(message))
-        
-        cooldown_end = pd.Timestamp.now(tz='UTC') + pd.Timedelta(minutes=cfg.SIGNAL_COOLDOWN_MINUTES)
-        cooldowns[symbol] = cooldown_end.isoformat()
-        save_cooldowns(cooldowns)
-        logging.info(f"Sent alert for {symbol}. Cooldown until {cooldown_end.strftime('%Y-%m-%d %H:%M:%S UTC')}")
-        time.sleep(1)
-
-# --- Main Execution ---
-if __name__ == "__main__":
-    logging.info("Starting Crypto Signal Bot (Diagnostic Mode)...")
-    check_for_signals()
-    schedule.every(cfg.BOT_SCHEDULE_MINUTES).minutes.do(check_for_signals)
-    logging.info(f"Scheduled to run every {cfg.BOT_SCHEDULE_MINUTES} minutes.")
-    while True:
-        schedule.run_pending()
-        time.sleep(1)
+# live_bot.py (UPDATED VERSION)
+
+from __future__ import annotations
+
+import time
+import logging
+import numpy as np
+import pandas as pd
+import asyncio
+import json
+import os
+import threading
+from pathlib import Path
+import traceback
+
+# ccxt and telegram are imported lazily inside the functions that need
+# them - ccxt alone pulls in every exchange module (~300ms) at import.
+
+from config import cfg
+import indicators_jit as taj
+
+# orjson parses and serializes several times faster than stdlib json;
+# fall back silently when it isn't installed.
+try:
+    import orjson
+    _HAS_ORJSON = True
+except ImportError:
+    _HAS_ORJSON = False
+
+# --- Setup Logging ---
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(message)s",
+    handlers=[
+        logging.FileHandler("live_bot.log"),
+        logging.StreamHandler()
+    ]
+)
+
+# How many OHLCV requests may be in flight at once (Bybit rate-limit headroom).
+FETCH_CONCURRENCY = 10
+
+# Bybit's market list barely changes within a process lifetime – cache the
+# parsed payload and re-download it at most once per TTL instead of per cycle.
+MARKETS_TTL_SECONDS = 6 * 3600
+_MARKETS_CACHE: dict | None = None
+_MARKETS_LOADED_AT = 0.0
+
+async def _load_markets_cached(bybit: ccxt_async.Exchange):
+    global _MARKETS_CACHE, _MARKETS_LOADED_AT
+    if _MARKETS_CACHE is not None and time.time() - _MARKETS_LOADED_AT < MARKETS_TTL_SECONDS:
+        bybit.set_markets(_MARKETS_CACHE)
+        return
+    _MARKETS_CACHE = await bybit.load_markets()
+    _MARKETS_LOADED_AT = time.time()
+
+# --- Helper functions for Cooldown ---
+COOLDOWN_FILE = Path("signal_cooldowns.json")
+
+def load_cooldowns() -> dict:
+    """Returns {symbol: expiry_epoch_ns}. Older files stored ISO strings."""
+    if not COOLDOWN_FILE.exists():
+        return {}
+    try:
+        data = COOLDOWN_FILE.read_bytes()
+        raw = orjson.loads(data) if _HAS_ORJSON else json.loads(data)
+    except (ValueError, FileNotFoundError):
+        return {}
+    return {k: (v if isinstance(v, int) else int(pd.Timestamp(v).value))
+            for k, v in raw.items()}
+
+def save_cooldowns(cooldowns: dict):
+    # Atomic replace so a crash mid-write can't corrupt the state file.
+    tmp = COOLDOWN_FILE.with_suffix('.tmp')
+    if _HAS_ORJSON:
+        tmp.write_bytes(orjson.dumps(cooldowns))
+    else:
+        tmp.write_text(json.dumps(cooldowns, separators=(',', ':')))
+    os.replace(tmp, COOLDOWN_FILE)
+
+# Loaded once at startup and kept in memory; flushed to disk on change.
+COOLDOWNS: dict = load_cooldowns()
+
+# Last processed bar-close (epoch seconds) per symbol. With a 1-minute
+# schedule on 5m candles most cycles see no new bar – skip those outright.
+_LAST_BAR_TS: dict[str, int] = {}
+
+# In-memory OHLCV frames keyed by (symbol, timeframe); the parquet files
+# under cfg.PARQUET_DIR are only the across-restart persistence layer.
+_OHLCV_CACHE: dict[tuple[str, str], pd.DataFrame] = {}
+
+# BTC regime barely moves between cycles - hold the strength scalar for
+# 1.5 schedule periods so consecutive cycles reuse it while it still
+# refreshes at least every other cycle.
+BTC_STRENGTH_TTL_SECONDS = cfg.BOT_SCHEDULE_MINUTES * 60 * 1.5
+_BTC_CTX = {'ts': 0.0, 'strong': False}
+
+# ccxt decodes every response body with stdlib json; on 300+ bar OHLCV
+# payloads orjson is ~5x faster, so patch it in once (class-wide) the
+# first time the lazy ccxt import actually happens.
+_CCXT_JSON_PATCHED = False
+
+def _patch_ccxt_json(ccxt_async) -> None:
+    global _CCXT_JSON_PATCHED
+    if _CCXT_JSON_PATCHED or not _HAS_ORJSON:
+        return
+
+    def _parse_json(self, http_response):
+        try:
+            return orjson.loads(http_response)
+        except ValueError:
+            return None  # mirrors ccxt's behavior on undecodable bodies
+
+    ccxt_async.Exchange.parse_json = _parse_json
+    _CCXT_JSON_PATCHED = True
+
+# One aiohttp session + ccxt client for the whole process. The bot runs
+# under a single asyncio.run() loop, so the connection pool (and its warm
+# TLS handshakes) survives across cycles instead of being rebuilt every
+# minute. Created lazily inside the running loop on first use.
+_HTTP_SESSION = None
+_BYBIT = None
+
+async def _get_bybit():
+    global _HTTP_SESSION, _BYBIT
+    if _BYBIT is not None:
+        return _BYBIT
+
+    import aiohttp
+    import ccxt.async_support as ccxt_async
+
+    _patch_ccxt_json(ccxt_async)
+    # A pooled connector with keep-alive lets the whole fetch fan-out
+    # reuse a handful of TLS connections instead of one per request.
+    _HTTP_SESSION = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=120)
+    )
+    try:
+        # ccxt's built-in throttler paces requests only as much as needed
+        # (120ms apart), replacing the old unconditional per-symbol sleeps.
+        _BYBIT = ccxt_async.bybit({
+            'enableRateLimit': True,
+            'rateLimit': 120,
+            'session': _HTTP_SESSION,
+            'options': {'defaultType': 'swap', 'defaultSubType': 'linear'},
+        })
+    except Exception:
+        # ccxt never owns a user-supplied session, so it is on us to
+        # close it whenever the client can't be built around it.
+        await _HTTP_SESSION.close()
+        _HTTP_SESSION = None
+        raise
+    return _BYBIT
+
+# Direct Bybit v5 kline endpoint – skips ccxt's per-call normalization on
+# the hottest request path. ccxt remains the fallback (and the market/
+# throttling layer) if the raw call fails for any reason.
+_KLINE_URL = "https://api.bybit.com/v5/market/kline"
+_BYBIT_INTERVALS = {
+    '1m': '1', '3m': '3', '5m': '5', '15m': '15', '30m': '30',
+    '1h': '60', '2h': '120', '4h': '240', '6h': '360', '12h': '720',
+    '1d': 'D', '1w': 'W', '1M': 'M',
+}
+
+async def _raw_kline(session, symbol: str, tf: str, since: int, limit: int) -> list:
+    """Fetch klines straight from /v5/market/kline.
+
+    Returns rows in ccxt's [ms, open, high, low, close, volume] shape,
+    oldest first, parsed with orjson when available.
+    """
+    params = {
+        'category': 'linear', 'symbol': symbol,
+        'interval': _BYBIT_INTERVALS[tf], 'start': since, 'limit': limit,
+    }
+    async with session.get(_KLINE_URL, params=params) as resp:
+        body = await resp.read()
+    data = orjson.loads(body) if _HAS_ORJSON else json.loads(body)
+    if data.get('retCode') != 0:
+        raise RuntimeError(f"kline retCode {data.get('retCode')} for {symbol}")
+    # Bybit answers newest-first with string values.
+    return [[int(r[0]), float(r[1]), float(r[2]), float(r[3]), float(r[4]), float(r[5])]
+            for r in reversed(data['result']['list'])]
+
+# --- CCXT Data Fetcher ---
+async def fetch_bybit_data(
+    symbol: str,
+    timeframe: str,
+    bybit: ccxt_async.Exchange,
+    limit: int = 300
+) -> pd.DataFrame | None:
+    """Fetches OHLCV from Bybit, handling pagination & errors.
+
+    Keeps a rolling parquet cache per (symbol, timeframe) under
+    cfg.PARQUET_DIR and only fetches the incremental tail (`since` the
+    last cached bar) once the cache is warm.
+    """
+    tf = timeframe.lower()
+    cache_file = cfg.PARQUET_DIR / f"{symbol.replace('/', '_')}_{tf}.parquet"
+
+    # Memory first; the parquet file is only consulted on cold start so
+    # steady-state cycles never touch the filesystem for reads.
+    cached = _OHLCV_CACHE.get((symbol, tf))
+    since = None
+    if cached is None and cache_file.exists():
+        try:
+            cached = pd.read_parquet(cache_file)
+        except Exception:
+            logging.warning(f"Unreadable cache {cache_file}, refetching from scratch.")
+            cached = None
+    if cached is not None and not cached.empty:
+        last_open_ms = int(cached.index[-1].timestamp() * 1000)
+        tf_ms = bybit.parse_timeframe(tf) * 1000
+        if bybit.milliseconds() - last_open_ms > limit * tf_ms:
+            # Cache so stale (bot was down for a while) that one delta
+            # request can't reach the present – start over with a bounded
+            # cold fetch rather than paging forward through dead history.
+            cached = None
+        else:
+            since = last_open_ms + 1
+            # The newest cached bar already sits in the current (still-
+            # forming) bucket, so a request could only re-download that
+            # same bar. Serve the cache straight back – on a 1-minute
+            # schedule this collapses the 1h frames to one request per
+            # hour and 1D to one per day.
+            if last_open_ms >= (bybit.milliseconds() // tf_ms) * tf_ms:
+                # Keep the frame in memory so a parquet-loaded cache isn't
+                # re-read from disk on every cycle until the bucket rolls.
+                _OHLCV_CACHE[(symbol, tf)] = cached
+                return cached if len(cached) <= limit else cached.tail(limit)
+
+    if since is None:
+        # Bybit answers faster (and smaller) when the query window is
+        # bounded. Bars come back ascending from `start`, so the window
+        # has to end at the present: limit-1 buckets back from the
+        # current one keeps the newest bars inside the response.
+        tf_ms = bybit.parse_timeframe(tf) * 1000
+        since = (bybit.milliseconds() // tf_ms - (limit - 1)) * tf_ms
+
+    try:
+        logging.info(f"Fetching {symbol} on {tf}...")
+        try:
+            ohlcv = await _raw_kline(bybit.session, symbol, tf, since, limit)
+        except Exception:
+            # Raw path failed (schema change, odd interval, transport error)
+            # - fall back to ccxt's normalized, rate-limited fetch.
+            ohlcv = await bybit.fetch_ohlcv(
+                symbol=symbol,
+                timeframe=tf,
+                since=since,
+                limit=limit
+            )
+        if not ohlcv and cached is None:
+            logging.warning(f"No data returned for {symbol} on {tf}.")
+            return None
+
+        if ohlcv:
+            # Go through one numpy array so pd.to_datetime takes the
+            # vectorized int64 fast path instead of iterating a Python list.
+            arr = np.asarray(ohlcv, dtype=np.float64)
+            idx = pd.to_datetime(arr[:, 0].astype(np.int64), unit='ms', utc=True)
+            # float32 gives ~7 significant digits – plenty for prices and
+            # percentage triggers – at half the memory bandwidth.
+            df = pd.DataFrame(
+                arr[:, 1:].astype(np.float32),
+                index=idx,
+                columns=['open', 'high', 'low', 'close', 'volume']
+            )
+            df.index.name = 'timestamp'
+            if cached is not None:
+                df = pd.concat([cached, df])
+                df = df[~df.index.duplicated(keep='last')]
+        else:
+            df = cached
+        # copy=False makes this a no-op except for legacy float64 caches.
+        df = df.tail(limit).astype(np.float32, copy=False)
+
+        _OHLCV_CACHE[(symbol, tf)] = df
+        if ohlcv:  # nothing new, nothing to persist
+            try:
+                df.to_parquet(cache_file, compression='zstd')
+            except Exception:
+                logging.warning(f"Could not write cache {cache_file}.")
+
+        logging.info(f"Retrieved {len(df)} bars for {symbol} on {tf} ({len(ohlcv)} new).")
+        return df
+
+    except Exception:
+        logging.error(f"An unexpected error occurred fetching data for {symbol} on {tf}:")
+        logging.error(traceback.format_exc())
+        return None
+
+# --- Websocket Kline Feed (optional) ---
+def _apply_ws_rows(symbol: str, tf: str, rows: list) -> bool:
+    """Folds pushed kline rows into the in-memory cache for (symbol, tf).
+
+    Returns True when the rows actually landed in the cache.
+    """
+    cached = _OHLCV_CACHE.get((symbol, tf))
+    if cached is None or not rows:
+        # REST bootstrap hasn't populated this frame yet - nothing to
+        # merge onto, and the next fetch will pick the bars up anyway.
+        return False
+    arr = np.asarray(rows, dtype=np.float64)
+    idx = pd.to_datetime(arr[:, 0].astype(np.int64), unit='ms', utc=True)
+    df = pd.DataFrame(
+        arr[:, 1:].astype(np.float32),
+        index=idx,
+        columns=['open', 'high', 'low', 'close', 'volume']
+    )
+    df.index.name = 'timestamp'
+    merged = pd.concat([cached, df])
+    merged = merged[~merged.index.duplicated(keep='last')]
+    if len(merged) > 600:
+        merged = merged.tail(600)
+    _OHLCV_CACHE[(symbol, tf)] = merged
+    return True
+
+async def _ws_kline_feed(symbols: list[str]):
+    """Maintains _OHLCV_CACHE from Bybit's public kline stream.
+
+    With the stream keeping the signal-timeframe frames current, the
+    bucket check in fetch_bybit_data serves them without a REST request;
+    REST stays as the bootstrap and the fallback whenever the stream
+    lags or drops.
+    """
+    import ccxt.pro as ccxt_pro
+
+    ex = ccxt_pro.bybit({
+        'options': {'defaultType': 'swap', 'defaultSubType': 'linear'},
+    })
+    subs = [[s, cfg.BOT_TIMEFRAME] for s in symbols]
+    feed_live = False
+    try:
+        while True:
+            try:
+                update = await ex.watch_ohlcv_for_symbols(subs)
+            except Exception:
+                logging.error("Kline stream error, retrying in 5s:")
+                logging.error(traceback.format_exc())
+                await asyncio.sleep(5)
+                continue
+            for symbol, tf_rows in update.items():
+                # ccxt keys updates by unified symbol (BTC/USDT:USDT); the
+                # cache is keyed by the raw Bybit id from symbols.txt.
+                sym_id = ex.market(symbol)['id']
+                for tf, rows in tf_rows.items():
+                    if _apply_ws_rows(sym_id, tf.lower(), rows) and not feed_live:
+                        feed_live = True
+                        logging.info(f"Websocket kline feed live ({sym_id} {tf}).")
+    finally:
+        await ex.close()
+
+# --- Telegram Notifier ---
+# One long-lived event loop (daemon thread) and one Bot instance for the
+# whole process, so the TLS connection to api.telegram.org is pooled
+# instead of being re-established for every alert.
+_TG_LOOP: asyncio.AbstractEventLoop | None = None
+_TG_BOT = None
+
+def _tg_loop() -> asyncio.AbstractEventLoop:
+    global _TG_LOOP
+    if _TG_LOOP is None:
+        _TG_LOOP = asyncio.new_event_loop()
+        threading.Thread(target=_TG_LOOP.run_forever, daemon=True).start()
+    return _TG_LOOP
+
+def _tg_bot():
+    import telegram
+
+    global _TG_BOT
+    if _TG_BOT is None:
+        _TG_BOT = telegram.Bot(token=cfg.TELEGRAM_BOT_TOKEN)
+    return _TG_BOT
+
+async def send_telegram_message(message: str):
+    try:
+        await _tg_bot().send_message(
+            chat_id=cfg.TELEGRAM_CHAT_ID,
+            text=message,
+            parse_mode='Markdown'
+        )
+        logging.info("Successfully sent Telegram notification.")
+    except Exception:
+        logging.error("Failed to send Telegram message:")
+        logging.error(traceback.format_exc())
+
+def dispatch_telegram_message(message: str):
+    """Schedules a send on the shared loop; returns a concurrent Future."""
+    return asyncio.run_coroutine_threadsafe(send_telegram_message(message), _tg_loop())
+
+# Per-symbol indicator-state key suffixes and bar-count constants derived
+# purely from cfg – built once at import instead of per symbol per cycle.
+_ATR_KEY = f"atr_{cfg.ATR_TIMEFRAME}"
+_RSI_KEY = f"rsi_{cfg.RSI_TIMEFRAME}"
+_BTC_EMA_KEY = f"ema{cfg.BTC_SLOW_EMA_PERIOD}_{cfg.BTC_SLOW_TIMEFRAME}"
+
+BARS_PER_HOUR = 60 // int(cfg.BOT_TIMEFRAME.replace('m', ''))
+BOOM_BAR_COUNT = BARS_PER_HOUR * cfg.PRICE_BOOM_PERIOD_H
+SLOWDOWN_BAR_COUNT = BARS_PER_HOUR * cfg.PRICE_SLOWDOWN_PERIOD_H
+
+# Alert template, parsed once at import. The cfg-derived labels are baked
+# straight in (cfg is frozen); only per-signal values flow through the
+# bound .format call in the signal branch.
+_MSG_TEMPLATE = (
+    "{title}\n\n"
+    "**Symbol:** `{symbol}`\n"
+    "**Time:** `{ts}` UTC\n\n"
+    "--- *Champion Filter Checklist* ---\n"
+    "{checklist}\n\n"
+    "--- *Actionable Trade Parameters* ---\n"
+    "**Entry Price:** `{entry:.4f}`\n"
+    f"**1. Stop-Loss (SL):** `{{sl:.4f}}` ({cfg.SL_ATR_MULT} ATR)\n"
+    f"**2. Partial Take-Profit (TP1):** `{{tp1:.4f}}` ({cfg.PARTIAL_TP_ATR_MULT} ATR)\n"
+    "**3. Trailing Stop Distance:** `{trail:.5f}` (Set after TP1 is hit)\n\n"
+    "--- *Informational Target* ---\n"
+    f"**Potential Target (TP2):** `{{tp2:.4f}}` ({cfg.TP2_ATR_MULT} ATR)\n"
+).format
+
+# --- Incremental Indicators ---
+# EMA/RSI/ATR have closed-form one-step updates, so recomputing them over
+# hundreds of bars every cycle is wasted work when at most one bar is new.
+# State is committed per (symbol, kind) up to the last *closed* source bar;
+# the newest (possibly still-forming) bar is folded in as a preview step
+# that never touches the stored state, so re-seeing it can't corrupt the
+# Wilder smoothing.
+_IND_STATE: dict[tuple[str, str], tuple] = {}
+
+def _resume_pos(state: tuple | None, ts: np.ndarray) -> int | None:
+    """Index of the cached state's bar inside `ts`, or None on cache miss."""
+    if state is None:
+        return None
+    pos = int(np.searchsorted(ts, state[0]))
+    if 0 <= pos <= len(ts) - 2 and ts[pos] == state[0]:
+        return pos
+    return None
+
+def _ema_value(key: tuple[str, str], series: pd.Series, span: int) -> float:
+    if len(series) < 2:
+        return float("nan")
+    ts = series.index.asi8
+    vals = series.to_numpy(dtype=np.float64)
+    alpha = 2.0 / (span + 1.0)
+    pos = _resume_pos(_IND_STATE.get(key), ts)
+    if pos is None:
+        ema = taj.ema_seed(vals[:-1], span)
+    else:
+        ema = taj.ema_catchup(_IND_STATE[key][1], vals[pos + 1:-1], alpha)
+    _IND_STATE[key] = (int(ts[-2]), ema)
+    return alpha * vals[-1] + (1.0 - alpha) * ema
+
+def _rsi_value(key: tuple[str, str], series: pd.Series, period: int) -> float:
+    if len(series) < period + 2:
+        return float("nan")
+    ts = series.index.asi8
+    vals = series.to_numpy(dtype=np.float64)
+    pos = _resume_pos(_IND_STATE.get(key), ts)
+    if pos is None:
+        # Seed Wilder state over the closed bars.
+        avg_gain, avg_loss = taj.rsi_seed(vals[:-1], period)
+        prev_close = vals[-2]
+    else:
+        _, avg_gain, avg_loss, prev_close = _IND_STATE[key]
+        avg_gain, avg_loss, prev_close = taj.rsi_catchup(
+            avg_gain, avg_loss, prev_close, vals[pos + 1:-1], period)
+    _IND_STATE[key] = (int(ts[-2]), avg_gain, avg_loss, prev_close)
+    d = vals[-1] - prev_close
+    ag = (avg_gain * (period - 1) + max(d, 0.0)) / period
+    al = (avg_loss * (period - 1) + max(-d, 0.0)) / period
+    if al == 0.0:
+        return 100.0
+    return 100.0 - 100.0 / (1.0 + ag / al)
+
+def _atr_value(key: tuple[str, str], df: pd.DataFrame, period: int) -> float:
+    if len(df) < period + 2:
+        return float("nan")
+    ts = df.index.asi8
+    high = df['high'].to_numpy(dtype=np.float64)
+    low = df['low'].to_numpy(dtype=np.float64)
+    close = df['close'].to_numpy(dtype=np.float64)
+    pos = _resume_pos(_IND_STATE.get(key), ts)
+    if pos is None:
+        atr = taj.atr_seed(high[:-1], low[:-1], close[:-1], period)
+        prev_close = close[-2]
+    else:
+        _, atr, prev_close = _IND_STATE[key]
+        atr, prev_close = taj.atr_catchup(
+            atr, prev_close, high[pos + 1:-1], low[pos + 1:-1], close[pos + 1:-1], period)
+    _IND_STATE[key] = (int(ts[-2]), atr, prev_close)
+    t = max(high[-1] - low[-1], abs(high[-1] - prev_close), abs(low[-1] - prev_close))
+    return (atr * (period - 1) + t) / period
+
+# --- Data Preparation ---
+async def _prep_live_data(
+    symbol: str,
+    bybit: ccxt_async.Exchange,
+    sem: asyncio.Semaphore
+) -> tuple[pd.DataFrame, float, float] | None:
+    async def _fetch(tf: str, limit: int = 300):
+        async with sem:
+            return await fetch_bybit_data(symbol, tf, bybit, limit=limit)
+
+    # ATR/RSI often share a timeframe (both "1h" by default) – fetch each
+    # unique timeframe exactly once and let the indicators share the frame.
+    tfs = [cfg.BOT_TIMEFRAME]
+    for tf in (cfg.ATR_TIMEFRAME, cfg.RSI_TIMEFRAME):
+        if tf not in tfs:
+            tfs.append(tf)
+
+    fetched = await asyncio.gather(
+        *[_fetch(tf, limit=500 if tf == cfg.BOT_TIMEFRAME else 300) for tf in tfs]
+    )
+    frames = dict(zip(tfs, fetched))
+
+    if any(d is None for d in frames.values()):
+        logging.warning(f"Could not fetch one or more essential timeframes for {symbol}. Skipping.")
+        return None
+
+    df5 = frames[cfg.BOT_TIMEFRAME]
+    df_atr_tf = frames[cfg.ATR_TIMEFRAME]
+    df_rsi_tf = frames[cfg.RSI_TIMEFRAME]
+
+    if len(df5) < 2:
+        logging.warning(f"Not enough {cfg.BOT_TIMEFRAME} bars for {symbol}. Skipping.")
+        return None
+
+    # 5x the period is ample warm-up for Wilder-style smoothing – no need to
+    # run the indicators over the whole fetched history every cycle.
+    atr_tail = df_atr_tf.iloc[-(cfg.ATR_PERIOD * 5):]
+    rsi_tail = df_rsi_tf["close"].iloc[-(cfg.RSI_PERIOD * 5):]
+
+    # Only the latest values are ever read – step them forward from the
+    # cached per-symbol state instead of recomputing the full series.
+    atr_val = _atr_value((symbol, _ATR_KEY), atr_tail, cfg.ATR_PERIOD)
+    rsi_val = _rsi_value((symbol, _RSI_KEY), rsi_tail, cfg.RSI_PERIOD)
+
+    if pd.isna(atr_val) or pd.isna(rsi_val):
+        logging.warning(f"ATR/RSI not available for {symbol}. Skipping.")
+        return None
+
+    return df5, atr_val, rsi_val
+
+# Watchlist parsed once and reused until the file's mtime changes, so
+# steady-state cycles skip the read and per-line string work entirely.
+_SYMBOLS_CACHE: tuple[str, ...] = ()
+_SYMBOLS_MTIME: float = -1.0
+
+def _load_symbols() -> tuple[str, ...]:
+    """Returns the watchlist, re-parsing only when the file changed."""
+    global _SYMBOLS_CACHE, _SYMBOLS_MTIME
+    mtime = cfg.SYMBOLS_FILE.stat().st_mtime
+    if mtime != _SYMBOLS_MTIME:
+        raw = cfg.SYMBOLS_FILE.read_text()
+        _SYMBOLS_CACHE = tuple(
+            line.split()[0].upper() for line in raw.splitlines()
+            if line.strip() and not line.lstrip().startswith("#")
+        )
+        _SYMBOLS_MTIME = mtime
+    return _SYMBOLS_CACHE
+
+# --- Main Signal Checking Logic ---
+async def check_for_signals():
+    logging.info("--- Starting new signal check cycle ---")
+
+    # Prune expired entries so the in-memory dict (and the file) stay bounded.
+    now_ns = time.time_ns()
+    expired = [s for s, v in COOLDOWNS.items() if v <= now_ns]
+    for s in expired:
+        del COOLDOWNS[s]
+
+    try:
+        symbols = _load_symbols()
+    except FileNotFoundError:
+        logging.error(f"'{cfg.SYMBOLS_FILE}' not found. Exiting.")
+        return
+
+    await _check_cycle(symbols)
+
+async def _check_cycle(symbols: list[str]):
+    # Cooldowns are epoch-ns ints, so symbol filtering is a plain integer
+    # compare against a single timestamp taken once per cycle. Doing it
+    # before the client even exists means an all-cooldown (or no-new-bar)
+    # cycle finishes with zero network I/O.
+    now_ns = time.time_ns()
+    tf_sec = 60 * int(cfg.BOT_TIMEFRAME.replace('m', ''))
+    expected_bar = (int(now_ns // 1_000_000_000) // tf_sec) * tf_sec - tf_sec
+    eligible = [
+        s for s in symbols
+        if COOLDOWNS.get(s, 0) <= now_ns and _LAST_BAR_TS.get(s) != expected_bar
+    ]
+    if not eligible:
+        logging.info("No eligible symbols this cycle; skipping fetches.")
+        return
+
+    try:
+        bybit = await _get_bybit()
+        await _load_markets_cached(bybit)
+    except Exception:
+        logging.error("Failed to initialize exchange or load markets:")
+        logging.error(traceback.format_exc())
+        return
+
+    sem = asyncio.Semaphore(FETCH_CONCURRENCY)
+
+    btc_is_strong = False
+    if cfg.BTC_SLOW_FILTER_ENABLED:
+        if time.time() - _BTC_CTX['ts'] < BTC_STRENGTH_TTL_SECONDS:
+            btc_is_strong = _BTC_CTX['strong']
+        else:
+            btc_df = await fetch_bybit_data("BTCUSDT", cfg.BTC_SLOW_TIMEFRAME, bybit)
+            if btc_df is not None and not btc_df.empty:
+                btc_close = btc_df['close'].iat[-1]
+                btc_ema = _ema_value(
+                    ("BTCUSDT", _BTC_EMA_KEY),
+                    btc_df['close'], cfg.BTC_SLOW_EMA_PERIOD
+                )
+                if pd.notna(btc_close) and pd.notna(btc_ema):
+                    btc_is_strong = btc_close > btc_ema
+            _BTC_CTX['ts'] = time.time()
+            _BTC_CTX['strong'] = btc_is_strong
+
+    # One parallel wave of fetches for every eligible symbol, bounded by the semaphore.
+    preps = await asyncio.gather(*[_prep_live_data(s, bybit, sem) for s in eligible])
+
+    # Alerts are collected over the whole cycle and sent as one digest
+    # (chunked under Telegram's message cap), so a burst of signals
+    # costs one round-trip instead of one per symbol.
+    pending_alerts: list[str] = []
+    cooldowns_dirty = False
+
+    # First pass: pull the three reference closes per symbol into
+    # structure-of-arrays form. Only the last closed bar is ever
+    # evaluated, so each symbol contributes three plain floats – no
+    # pandas __getitem__ dispatch or scalar boxing per lookup.
+    rows = []
+    for symbol, prep in zip(eligible, preps):
+        logging.info(f"--- Checking {symbol} ---")
+
+        if prep is None:
+            logging.warning(f"Could not prepare data for {symbol}, skipping.")
+            continue
+
+        df_prep, atr_value, rsi_val = prep
+        # Only mark the bucket done when the frame actually reaches it
+        # - recording it for a stale frame would suppress evaluation
+        # of the real bar for the rest of the bucket.
+        if int(df_prep.index[-2].timestamp()) == expected_bar:
+            _LAST_BAR_TS[symbol] = expected_bar
+
+        if len(df_prep) < BOOM_BAR_COUNT + 2:
+            logging.warning(f"Not enough history for {symbol}, skipping.")
+            continue
+
+        closes = df_prep["close"].to_numpy()
+        rows.append((symbol, df_prep, atr_value, rsi_val,
+                     closes[-2], closes[-2 - BOOM_BAR_COUNT],
+                     closes[-2 - SLOWDOWN_BAR_COUNT]))
+
+    if not rows:
+        return
+
+    # Both trigger inequalities evaluate across all symbols in two
+    # vectorized passes; the Python loop below only ever sees the
+    # handful of candidates that survive the ~99% rejection path.
+    close_now_arr = np.array([r[4] for r in rows])
+    boom_rets = close_now_arr / np.array([r[5] for r in rows]) - 1.0
+    slowdown_rets = close_now_arr / np.array([r[6] for r in rows]) - 1.0
+    candidates = (boom_rets >= cfg.PRICE_BOOM_PCT) & (slowdown_rets <= cfg.PRICE_SLOWDOWN_PCT)
+
+    for i in np.nonzero(candidates)[0]:
+        symbol, df_prep, atr_value, rsi_val, close_now, _, _ = rows[i]
+        boom_ret = boom_rets[i]
+        slowdown_ret = slowdown_rets[i]
+        signal_ts = df_prep.index[-2]
+
+        logging.info(f"!!! POTENTIAL SIGNAL FOUND for {symbol} !!! Building report...")
+
+        champion_boom_ok = boom_ret >= cfg.CHAMPION_MIN_BOOM_PCT
+        champion_rsi_ok = rsi_val >= cfg.CHAMPION_MIN_RSI
+
+        champion_btc_ok = btc_is_strong
+        champion_slow_ok = True  # gated on above
+
+        all_champion_filters_met = champion_boom_ok and champion_rsi_ok and champion_btc_ok
+
+        title = "✅ *CHAMPION SIGNAL* ✅" if all_champion_filters_met else "⚠️ *POTENTIAL SIGNAL* ⚠️"
+
+        filter_lines = [
+            f"{'✅' if champion_boom_ok else '❌'} *Boom > {cfg.CHAMPION_MIN_BOOM_PCT:.0%}?* (`{boom_ret:.2%}`)",
+            f"{'✅' if champion_slow_ok  else '❌'} *Slowdown ≤ {cfg.PRICE_SLOWDOWN_PCT:.0%}?* (`{slowdown_ret:.2%}`)\n",
+            f"{'✅' if champion_rsi_ok else '❌'} *RSI > {cfg.CHAMPION_MIN_RSI}?* (`{rsi_val:.2f}`)",
+            f"{'✅' if champion_btc_ok else '❌'} *BTC Strong?* (`{btc_is_strong}`)"
+        ]
+        filter_checklist = "\n".join(filter_lines)
+
+        entry_price = close_now
+
+        stop_loss = entry_price + cfg.SL_ATR_MULT * atr_value
+        partial_tp = entry_price - cfg.PARTIAL_TP_ATR_MULT * atr_value
+        tp2_price = entry_price - cfg.TP2_ATR_MULT * atr_value
+        trail_dist = cfg.TRAIL_ATR_MULT_FINAL * atr_value
+
+        message = _MSG_TEMPLATE(
+            title=title,
+            symbol=symbol,
+            ts=signal_ts.strftime('%Y-%m-%d %H:%M'),
+            checklist=filter_checklist,
+            entry=entry_price,
+            sl=stop_loss,
+            tp1=partial_tp,
+            trail=trail_dist,
+            tp2=tp2_price,
+        )
+
+        pending_alerts.append(message)
+
+        expiry_ns = time.time_ns() + cfg.SIGNAL_COOLDOWN_MINUTES * 60 * 1_000_000_000
+        COOLDOWNS[symbol] = expiry_ns
+        cooldowns_dirty = True
+        logging.info(f"Queued alert for {symbol}. Cooldown until {pd.Timestamp(expiry_ns, tz='UTC').strftime('%Y-%m-%d %H:%M:%S UTC')}")
+
+    # One atomic state-file write per cycle, however many signals fired.
+    if cooldowns_dirty:
+        save_cooldowns(COOLDOWNS)
+
+    if pending_alerts:
+        sep = "\n\n---\n\n"
+        chunks = [pending_alerts[0]]
+        for alert in pending_alerts[1:]:
+            # 4096 chars is Telegram's hard per-message limit.
+            if len(chunks[-1]) + len(sep) + len(alert) <= 4096:
+                chunks[-1] += sep + alert
+            else:
+                chunks.append(alert)
+        await asyncio.gather(*[
+            asyncio.wrap_future(dispatch_telegram_message(c)) for c in chunks
+        ])
+
+# --- Main Execution ---
+# Fire a few seconds after each schedule boundary so the just-closed bar
+# is already queryable; aligned ticks mean a 5m bar close is picked up
+# within seconds instead of anywhere inside the schedule window.
+_SCHEDULE_OFFSET_SECONDS = 5.0
+
+# The event loop only keeps weak references to tasks, so the websocket
+# feed must be pinned here or it can be garbage-collected mid-flight.
+_WS_TASK: asyncio.Task | None = None
+
+def _ws_task_done(task: asyncio.Task) -> None:
+    if task.cancelled():
+        return
+    logging.error("Websocket kline feed task exited unexpectedly.")
+    exc = task.exception()
+    if exc is not None:
+        logging.error("".join(traceback.format_exception(exc)))
+
+async def main_loop():
+    global _WS_TASK
+    logging.info(f"Scheduled to run every {cfg.BOT_SCHEDULE_MINUTES} minutes.")
+    if cfg.WS_KLINE_ENABLED:
+        try:
+            _WS_TASK = asyncio.create_task(_ws_kline_feed(list(_load_symbols())))
+            _WS_TASK.add_done_callback(_ws_task_done)
+        except FileNotFoundError:
+            logging.error("Symbols file missing; websocket feed not started.")
+    period = cfg.BOT_SCHEDULE_MINUTES * 60
+    while True:
+        try:
+            await check_for_signals()
+        except Exception:
+            logging.error("Signal check cycle failed:")
+            logging.error(traceback.format_exc())
+        now = time.time()
+        next_fire = (int(now) // period + 1) * period + _SCHEDULE_OFFSET_SECONDS
+        await asyncio.sleep(max(0.0, next_fire - now))
+
+if __name__ == "__main__":
+    logging.info("Starting Crypto Signal Bot (Diagnostic Mode)...")
+    asyncio.run(main_loop())